@@ -3,13 +3,34 @@ AWS Security Group Report Generator
 Analyzes collected AWS security group data and generates professional PDF report
 """
 
+import collections
+import functools
 import json
+import itertools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, fields
 import os
+import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
-from jinja2 import Environment, FileSystemLoader
+# ijson parses the audit file incrementally so only one region is held in
+# memory at a time. Prefer the C (yajl2) backend, fall back to pure Python.
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    import ijson
+# orjson (C-accelerated) is used to load small audit files in one shot;
+# json.loads also accepts bytes, so it is a drop-in fallback
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 try:
     from weasyprint import HTML
     WEASYPRINT_AVAILABLE = True
@@ -17,8 +38,40 @@ except (ImportError, OSError) as e:
     WEASYPRINT_AVAILABLE = False
     print(f"Warning: WeasyPrint not available: {e}")
     print("PDF generation will be skipped. HTML report will still be generated.")
-import plotly.graph_objects as go
-import plotly.express as px
+# Figures are created through the object-oriented API (not pyplot) so each
+# chart owns its Figure and can be rendered on its own thread; savefig uses
+# the in-process Agg canvas, with no display or browser required
+from matplotlib.figure import Figure
+
+
+# Network interface attached to a security group; a tuple is much smaller
+# than a dict with the same three keys
+Attachment = collections.namedtuple('Attachment', 'eni_id description private_ip')
+
+
+@dataclass
+class Finding:
+    """
+    A single audit finding as rendered in the report.
+    
+    __slots__ is declared by hand (rather than dataclass(slots=True),
+    which needs Python 3.10) so instances carry no per-object __dict__.
+    """
+    __slots__ = (
+        'type', 'severity', 'region', 'sg_id', 'sg_name', 'vpc_id', 'rule',
+        'description', 'attached_resources', 'attachments', 'recommendation'
+    )
+    type: str
+    severity: str
+    region: str
+    sg_id: str
+    sg_name: str
+    vpc_id: str
+    rule: str
+    description: str
+    attached_resources: int
+    attachments: List[Attachment]
+    recommendation: str
 
 
 class SecurityGroupAnalyzer:
@@ -53,143 +106,296 @@ class SecurityGroupAnalyzer:
     }
     
     # Critical ports that should NEVER be open to 0.0.0.0/0
-    CRITICAL_PORTS = {22, 23, 3389, 1433, 3306, 5432, 6379, 27017, 9200}
+    CRITICAL_PORTS = frozenset({22, 23, 3389, 1433, 3306, 5432, 6379, 27017, 9200})
     
     # Management/admin ports
-    MANAGEMENT_PORTS = {22, 3389, 5900, 5985, 5986}
+    MANAGEMENT_PORTS = frozenset({22, 3389, 5900, 5985, 5986})
+    
+    # Port groups that share a recommendation in _get_recommendation
+    _MGMT_RECOMMEND_PORTS = frozenset({22, 3389})
+    _DB_RECOMMEND_PORTS = frozenset({1433, 3306, 5432, 27017, 6379, 9200})
+    
+    # Classification bits stored per port in _PORT_TABLE
+    PORT_CRITICAL = 0b001
+    PORT_MANAGEMENT = 0b010
+    PORT_RISKY = 0b100
+    
+    # Lookup tables indexed by port number, built once per process
+    _PORT_TABLE = None
+    _PORT_NAME = None
+    
+    # Below this many regions a worker pool costs more than it saves
+    PARALLEL_MIN_REGIONS = 3
+    
+    # Severity levels, most severe first
+    SEVERITIES = ['critical', 'high', 'medium', 'low', 'info']
+    
+    # Column schema of every finding row, in Finding field order
+    FINDING_COLUMNS = [field.name for field in fields(Finding)]
+    
+    # Column schema of buffered internet-exposed ingress rules
+    INGRESS_COLUMNS = [
+        'region', 'sg_id', 'sg_name', 'vpc_id', 'from_port', 'to_port',
+        'protocol', 'cidr', 'port_display', 'description',
+        'attached_resources', 'attachments'
+    ]
+    
+    __slots__ = (
+        'data', 'stats', 'all_security_groups', '_ingress_rows',
+        '_finding_rows', 'findings_df'
+    )
     
     def __init__(self, data: Dict[str, Any]):
         self.data = data
-        self.findings = {
-            'critical': [],
-            'high': [],
-            'medium': [],
-            'low': [],
-            'info': []
-        }
+        if SecurityGroupAnalyzer._PORT_TABLE is None:
+            self._build_port_tables()
+        # Findings are plain tuples in FINDING_COLUMNS order; they carry no
+        # per-row key strings and become findings_df once analysis ends
+        self._finding_rows = []
+        self.findings_df = None
         self.stats = {
+            'total_regions': 0,
             'total_sgs': 0,
             'unused_sgs': 0,
             'risky_rules': 0,
-            'overlapping_rules': 0
+            'overlapping_rules': 0,
+            'by_severity': collections.Counter()  # Findings per severity level
         }
         self.all_security_groups = []  # Comprehensive list of all SGs with details
+        self._ingress_rows = []  # Public ingress rules awaiting classification
+        
+    @classmethod
+    def _build_port_tables(cls):
+        """
+        Build 65536-entry lookup tables over the whole port space.
+        
+        Each byte of _PORT_TABLE packs the critical/management/risky flags
+        for one port, so classifying a column of ports is a single array
+        index instead of three hashed set lookups per port.
+        """
+        table = np.zeros(65536, dtype=np.uint8)
+        table[list(cls.CRITICAL_PORTS)] |= cls.PORT_CRITICAL
+        table[list(cls.MANAGEMENT_PORTS)] |= cls.PORT_MANAGEMENT
+        table[list(cls.RISKY_PORTS)] |= cls.PORT_RISKY
+        
+        names = np.empty(65536, dtype=object)
+        for port, name in cls.RISKY_PORTS.items():
+            names[port] = name
         
+        cls._PORT_TABLE = table
+        cls._PORT_NAME = names
+    
     def analyze(self) -> Dict[str, Any]:
         """Perform comprehensive security analysis"""
+        return self.analyze_stream(self.data['regions'])
+    
+    def analyze_stream(self, regions_iter: Iterable[Dict]) -> Dict[str, Any]:
+        """
+        Perform security analysis on regions as they are yielded.
+        
+        Regions are independent, so they are analyzed in a process pool
+        and merged in input order. Regions are pulled from the iterator
+        one batch (one region per CPU) at a time to keep memory bounded
+        when streaming; small accounts are analyzed serially.
+        """
         print("Starting security analysis...")
         
-        for region_data in self.data['regions']:
-            region = region_data['region_name']
-            print(f"  Analyzing region: {region}")
-            
-            security_groups = region_data.get('security_groups', [])
-            network_interfaces = region_data.get('network_interfaces', [])
-            
-            self.stats['total_sgs'] += len(security_groups)
-            
-            # Build attachment mapping
-            sg_attachments = self._build_attachment_map(network_interfaces)
-            
-            for sg in security_groups:
-                self._analyze_security_group(sg, region, sg_attachments)
-                # Collect comprehensive SG data for table
-                self._collect_sg_summary(sg, region, sg_attachments)
+        regions_iter = iter(regions_iter)
+        batch_size = max(self.PARALLEL_MIN_REGIONS, os.cpu_count() or 1)
+        batch = list(itertools.islice(regions_iter, batch_size))
+        
+        if len(batch) < self.PARALLEL_MIN_REGIONS:
+            for region_data in batch:
+                self.analyze_region(region_data)
+        else:
+            with multiprocessing.Pool() as pool:
+                while batch:
+                    for result in pool.map(_analyze_region, batch):
+                        self._merge_region_result(*result)
+                    batch = list(itertools.islice(regions_iter, batch_size))
+        
+        self.findings_df = pd.DataFrame.from_records(
+            self._finding_rows, columns=self.FINDING_COLUMNS
+        )
+        self._finding_rows = []
         
         print("  Analysis complete!")
         return {
-            'findings': self.findings,
+            'findings': self._findings_by_severity(),
+            'findings_df': self.findings_df,
             'stats': self.stats,
             'all_security_groups': self.all_security_groups
         }
     
-    def _build_attachment_map(self, network_interfaces: List[Dict]) -> Dict[str, List[str]]:
+    def analyze_region(self, region_data: Dict):
+        """Analyze all security groups of a single region"""
+        self.stats['total_regions'] += 1
+        # Low-cardinality strings are interned so repeated findings share
+        # one copy instead of each holding its own parsed string
+        region = sys.intern(region_data['region_name'])
+        print(f"  Analyzing region: {region}")
+        
+        security_groups = region_data.get('security_groups', [])
+        network_interfaces = region_data.get('network_interfaces', [])
+        
+        self.stats['total_sgs'] += len(security_groups)
+        
+        # Build attachment mapping
+        sg_attachments = self._build_attachment_map(network_interfaces)
+        
+        for sg in security_groups:
+            self._analyze_security_group(sg, region, sg_attachments)
+        
+        # Classify this region's exposed ingress rules in one pass
+        self._classify_ingress_rows()
+    
+    def _merge_region_result(self, finding_rows: List[tuple], stats: Dict[str, Any],
+                             security_groups: List[Dict]):
+        """Fold one region's results from a worker process into this analyzer"""
+        self._finding_rows.extend(finding_rows)
+        for key, value in stats.items():
+            self.stats[key] += value
+        self.all_security_groups.extend(security_groups)
+    
+    def _build_attachment_map(self, network_interfaces: List[Dict]) -> Dict[str, List[Attachment]]:
         """Build map of security group ID to attached resources"""
-        attachments = {}
+        attachments = collections.defaultdict(list)
         
         for eni in network_interfaces:
-            eni_id = eni.get('NetworkInterfaceId', 'unknown')
-            description = eni.get('Description', '')
-            
-            for group in eni.get('Groups', []):
-                sg_id = group['GroupId']
-                if sg_id not in attachments:
-                    attachments[sg_id] = []
-                attachments[sg_id].append({
-                    'eni_id': eni_id,
-                    'description': description,
-                    'private_ip': eni.get('PrivateIpAddress', 'N/A')
-                })
+            # One shared record per ENI, whichever groups it belongs to
+            row = Attachment(
+                eni.get('NetworkInterfaceId', 'unknown'),
+                eni.get('Description', ''),
+                eni.get('PrivateIpAddress', 'N/A')
+            )
+            for group in eni.get('Groups', ()):
+                attachments[group['GroupId']].append(row)
         
         return attachments
     
     def _analyze_security_group(self, sg: Dict, region: str, attachments: Dict):
-        """Analyze individual security group for risks"""
+        """Analyze individual security group for risks and record its summary"""
         sg_id = sg['GroupId']
         sg_name = sg['GroupName']
-        vpc_id = sg.get('VpcId', 'EC2-Classic')
+        vpc_id = sys.intern(sg.get('VpcId', 'EC2-Classic'))
         
         # Check if unused
         attached_resources = attachments.get(sg_id, [])
         if not attached_resources and sg_name != 'default':
             self.stats['unused_sgs'] += 1
-            self.findings['info'].append({
-                'type': 'Unused Security Group',
-                'severity': 'INFO',
-                'region': region,
-                'sg_id': sg_id,
-                'sg_name': sg_name,
-                'vpc_id': vpc_id,
-                'description': f"Security group '{sg_name}' has no attached resources",
-                'recommendation': 'Consider removing unused security groups to reduce complexity'
-            })
-        
-        # Analyze ingress rules
+            self.stats['by_severity']['info'] += 1
+            self._finding_rows.append((
+                'Unused Security Group', 'INFO', region, sg_id, sg_name, vpc_id, '',
+                f"Security group '{sg_name}' has no attached resources",
+                0, [],
+                'Consider removing unused security groups to reduce complexity'
+            ))
+        
+        # Attachments shown per finding; sliced once and shared by every
+        # finding of this group
+        attached_head = attached_resources[:5]
+        
+        # Analyze ingress rules, collecting the summary table rows as we go
+        ingress_rules = []
         for rule in sg.get('IpPermissions', []):
-            self._analyze_rule(rule, sg, region, 'ingress', attached_resources)
+            rule_summary = self._analyze_rule(
+                rule, sg_id, sg_name, vpc_id, region, 'ingress',
+                attached_resources, attached_head
+            )
+            if rule_summary:
+                ingress_rules.append(rule_summary)
         
         # Analyze egress rules (less critical but still important)
         for rule in sg.get('IpPermissionsEgress', []):
-            self._analyze_rule(rule, sg, region, 'egress', attached_resources)
+            self._analyze_rule(
+                rule, sg_id, sg_name, vpc_id, region, 'egress',
+                attached_resources, attached_head
+            )
+        
+        # Comprehensive SG data for the summary table
+        self.all_security_groups.append({
+            'sg_id': sg_id,
+            'sg_name': sg_name,
+            'region': region,
+            'vpc_id': vpc_id,
+            'attached_resources_count': len(attached_resources),
+            'ingress_rules': ingress_rules,
+            'is_used': len(attached_resources) > 0
+        })
     
-    def _analyze_rule(self, rule: Dict, sg: Dict, region: str, direction: str, attachments: List):
-        """Analyze individual security group rule"""
-        sg_id = sg['GroupId']
-        sg_name = sg['GroupName']
-        vpc_id = sg.get('VpcId', 'EC2-Classic')
+    def _analyze_rule(self, rule: Dict, sg_id: str, sg_name: str, vpc_id: str,
+                      region: str, direction: str, attachments: List,
+                      attachments_head: List) -> Optional[Dict]:
+        """
+        Analyze individual security group rule.
         
+        Returns the summary table row for an ingress rule, or None for
+        egress rules and rules with no CIDR sources.
+        """
         from_port = rule.get('FromPort', 'All')
         to_port = rule.get('ToPort', 'All')
-        ip_protocol = rule.get('IpProtocol', 'All')
-        
+        ip_protocol = sys.intern(rule.get('IpProtocol', 'All'))
         if ip_protocol == '-1':
             ip_protocol = 'All'
-            port_display = 'All Ports'
-        elif from_port == to_port:
-            port_display = f"Port {from_port}"
-        else:
-            port_display = f"Ports {from_port}-{to_port}"
+        
+        # Only all-protocol egress can produce a finding, and egress rules
+        # have no summary row, so skip walking their CIDR ranges entirely
+        if direction == 'egress' and ip_protocol != 'All':
+            return None
+        
+        cidrs = []
         
         # Check IPv4 ranges
         for ip_range in rule.get('IpRanges', []):
             cidr = ip_range.get('CidrIp', '')
+            cidrs.append(cidr)
             self._check_risky_cidr(
-                cidr, from_port, to_port, ip_protocol, port_display,
-                sg_id, sg_name, vpc_id, region, direction, attachments, ip_range
+                cidr, from_port, to_port, ip_protocol,
+                sg_id, sg_name, vpc_id, region, direction, attachments,
+                attachments_head, ip_range
             )
         
         # Check IPv6 ranges
         for ip_range in rule.get('Ipv6Ranges', []):
             cidr = ip_range.get('CidrIpv6', '')
+            cidrs.append(cidr)
             self._check_risky_cidr(
-                cidr, from_port, to_port, ip_protocol, port_display,
-                sg_id, sg_name, vpc_id, region, direction, attachments, ip_range
+                cidr, from_port, to_port, ip_protocol,
+                sg_id, sg_name, vpc_id, region, direction, attachments,
+                attachments_head, ip_range
             )
+        
+        if not cidrs or direction != 'ingress':
+            return None
+        return {
+            'port': self._format_port_range(from_port, to_port, ip_protocol),
+            'protocol': ip_protocol,
+            'source': ', '.join(cidrs)
+        }
+    
+    @staticmethod
+    def _format_port_range(from_port: Any, to_port: Any, ip_protocol: str) -> str:
+        """Format rule ports for the summary table, e.g. '22' or '8000-8080'"""
+        if ip_protocol == 'All':
+            return 'All Ports'
+        if from_port == to_port:
+            return str(from_port)
+        return f"{from_port}-{to_port}"
+    
+    @classmethod
+    def _format_port_display(cls, from_port: Any, to_port: Any, ip_protocol: str) -> str:
+        """Format rule ports for a finding, e.g. 'Port 22' or 'Ports 8000-8080'"""
+        port_range = cls._format_port_range(from_port, to_port, ip_protocol)
+        if ip_protocol == 'All':
+            return port_range
+        if from_port == to_port:
+            return f"Port {port_range}"
+        return f"Ports {port_range}"
     
     def _check_risky_cidr(self, cidr: str, from_port: Any, to_port: Any, 
-                          ip_protocol: str, port_display: str, sg_id: str, 
+                          ip_protocol: str, sg_id: str, 
                           sg_name: str, vpc_id: str, region: str, direction: str,
-                          attachments: List, ip_range: Dict):
+                          attachments: List, attachments_head: List, ip_range: Dict):
         """Check if CIDR range poses security risk"""
         
         is_public = cidr in ['0.0.0.0/0', '::/0']
@@ -200,178 +406,257 @@ class SecurityGroupAnalyzer:
         if direction == 'egress':
             # Egress to internet is common, only flag if all protocols
             if ip_protocol == 'All':
-                self.findings['low'].append({
-                    'type': 'Permissive Egress Rule',
-                    'severity': 'LOW',
-                    'region': region,
-                    'sg_id': sg_id,
-                    'sg_name': sg_name,
-                    'vpc_id': vpc_id,
-                    'rule': f"{direction.upper()}: {port_display} ({ip_protocol})  {cidr}",
-                    'description': f"All outbound traffic allowed to internet",
-                    'attached_resources': len(attachments),
-                    'recommendation': 'Consider restricting egress to specific ports/protocols'
-                })
+                port_display = self._format_port_display(from_port, to_port, ip_protocol)
+                self.stats['by_severity']['low'] += 1
+                self._finding_rows.append((
+                    'Permissive Egress Rule', 'LOW', region, sg_id, sg_name, vpc_id,
+                    f"{direction.upper()}: {port_display} ({ip_protocol})  {cidr}",
+                    "All outbound traffic allowed to internet",
+                    len(attachments), [],
+                    'Consider restricting egress to specific ports/protocols'
+                ))
             return
         
-        # Ingress rules from internet
+        # Ingress rules from internet; severity is assigned in bulk by
+        # _classify_ingress_rows once the whole region has been walked
         self.stats['risky_rules'] += 1
         
-        # Determine severity
-        severity = 'MEDIUM'
-        risk_type = 'Internet-Exposed Port'
-        
-        # Check for critical ports
-        if isinstance(from_port, int):
-            if from_port in self.CRITICAL_PORTS or to_port in self.CRITICAL_PORTS:
-                severity = 'CRITICAL'
-                risk_type = 'Critical Port Exposed to Internet'
-            elif from_port in self.MANAGEMENT_PORTS or to_port in self.MANAGEMENT_PORTS:
-                severity = 'HIGH'
-                risk_type = 'Management Port Exposed to Internet'
-            elif from_port in self.RISKY_PORTS or to_port in self.RISKY_PORTS:
-                severity = 'HIGH'
-                risk_type = 'Risky Port Exposed to Internet'
-        
-        # All protocols/ports open is critical
-        if ip_protocol == 'All':
-            severity = 'CRITICAL'
-            risk_type = 'All Protocols/Ports Open to Internet'
+        self._ingress_rows.append((
+            region, sg_id, sg_name, vpc_id, from_port, to_port, ip_protocol,
+            cidr, self._format_port_display(from_port, to_port, ip_protocol),
+            ip_range.get('Description', 'No description provided'),
+            len(attachments),
+            attachments_head  # First 5 attachments, sliced once per SG
+        ))
+    
+    def _classify_ingress_rows(self):
+        """
+        Classify buffered internet-exposed ingress rules into findings.
         
-        port_name = ''
-        if isinstance(from_port, int) and from_port in self.RISKY_PORTS:
-            port_name = f" ({self.RISKY_PORTS[from_port]})"
+        Rather than branching per rule, the rules are loaded into a
+        DataFrame and severities are derived from vectorized port-set
+        masks. np.select picks the first matching condition, mirroring
+        the precedence: all protocols > critical > management > risky.
+        """
+        if not self._ingress_rows:
+            return
         
-        finding = {
-            'type': risk_type,
-            'severity': severity,
-            'region': region,
-            'sg_id': sg_id,
-            'sg_name': sg_name,
-            'vpc_id': vpc_id,
-            'rule': f"INGRESS: {port_display}{port_name} ({ip_protocol})  {cidr}",
-            'description': ip_range.get('Description', 'No description provided'),
-            'attached_resources': len(attachments),
-            'attachments': attachments[:5],  # Limit to first 5 for display
-            'recommendation': self._get_recommendation(from_port, ip_protocol)
-        }
+        df = pd.DataFrame.from_records(self._ingress_rows, columns=self.INGRESS_COLUMNS)
+        self._ingress_rows = []
+        
+        # Ports are 'All' when the rule has no port range, and ICMP rules
+        # use -1; both index port 0, which carries no flags or name
+        from_ports = pd.to_numeric(df['from_port'], errors='coerce')
+        to_ports = pd.to_numeric(df['to_port'], errors='coerce')
+        has_ports = from_ports.notna().to_numpy()
+        from_idx = self._port_index(from_ports)
+        to_idx = self._port_index(to_ports)
+        
+        flags = self._PORT_TABLE[from_idx] | self._PORT_TABLE[to_idx]
+        flags[~has_ports] = 0
+        
+        conditions = [
+            (df['protocol'] == 'All').to_numpy(),
+            (flags & self.PORT_CRITICAL) != 0,
+            (flags & self.PORT_MANAGEMENT) != 0,
+            (flags & self.PORT_RISKY) != 0,
+        ]
+        df['severity'] = np.select(
+            conditions, ['CRITICAL', 'CRITICAL', 'HIGH', 'HIGH'], default='MEDIUM'
+        )
+        df['type'] = np.select(conditions, [
+            'All Protocols/Ports Open to Internet',
+            'Critical Port Exposed to Internet',
+            'Management Port Exposed to Internet',
+            'Risky Port Exposed to Internet',
+        ], default='Internet-Exposed Port')
+        
+        # np.select builds a fresh string per row; share one copy of each
+        df['severity'] = df['severity'].map(sys.intern)
+        df['type'] = df['type'].map(sys.intern)
+        
+        port_names = pd.Series(self._PORT_NAME[from_idx], index=df.index)
+        port_names = (' (' + port_names + ')').where(port_names.notna(), '')
+        df['rule'] = (
+            'INGRESS: ' + df['port_display'] + port_names
+            + ' (' + df['protocol'] + ')  ' + df['cidr']
+        )
+        df['recommendation'] = [
+            self._get_recommendation(port, protocol)
+            for port, protocol in zip(df['from_port'], df['protocol'])
+        ]
         
-        self.findings[severity.lower()].append(finding)
+        self._finding_rows.extend(
+            df[self.FINDING_COLUMNS].itertuples(index=False, name=None)
+        )
+        self.stats['by_severity'].update(df['severity'].str.lower())
+    
+    def _findings_by_severity(self) -> Dict[str, List[Finding]]:
+        """
+        Split findings_df into per-severity lists of Finding records for
+        the template. Lists rather than bare iterators are used because the
+        template tests each severity for emptiness before looping over it.
+        """
+        severities = self.findings_df['severity'].str.lower()
+        return {
+            severity: [
+                Finding(*row)
+                for row in self.findings_df[severities == severity].itertuples(index=False, name=None)
+            ]
+            for severity in self.SEVERITIES
+        }
     
-    def _get_recommendation(self, port: Any, protocol: str) -> str:
-        """Get security recommendation based on finding"""
+    @staticmethod
+    def _port_index(ports: pd.Series) -> np.ndarray:
+        """Map a port column to lookup-table indices, sending invalid ports to 0"""
+        in_range = ports.between(0, 65535)
+        return ports.where(in_range, 0).to_numpy(dtype=np.int64)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_recommendation(port: Any, protocol: str) -> str:
+        """Get security recommendation based on finding (memoized per port/protocol)"""
         if protocol == 'All':
             return 'URGENT: Restrict to specific protocols and ports. Use VPN or bastion host for management access.'
         
         if isinstance(port, int):
-            if port in {22, 3389}:
+            if port in SecurityGroupAnalyzer._MGMT_RECOMMEND_PORTS:
                 return 'Use AWS Systems Manager Session Manager or VPN instead of direct internet access'
-            elif port in {1433, 3306, 5432, 27017, 6379, 9200}:
+            elif port in SecurityGroupAnalyzer._DB_RECOMMEND_PORTS:
                 return 'Database should NEVER be exposed to internet. Use VPN, VPC peering, or PrivateLink'
             elif port == 23:
                 return 'Telnet is insecure and deprecated. Use SSH instead and restrict access'
         
         return 'Restrict source to specific IP addresses or use AWS security services (CloudFront, ALB, etc.)'
-    
-    def _collect_sg_summary(self, sg: Dict, region: str, attachments: Dict):
-        """Collect comprehensive security group data for summary table"""
-        sg_id = sg['GroupId']
-        sg_name = sg['GroupName']
-        vpc_id = sg.get('VpcId', 'EC2-Classic')
-        attached_resources = attachments.get(sg_id, [])
-        
-        # Collect all ingress rules
-        ingress_rules = []
-        for rule in sg.get('IpPermissions', []):
-            from_port = rule.get('FromPort', 'All')
-            to_port = rule.get('ToPort', 'All')
-            ip_protocol = rule.get('IpProtocol', 'All')
-            
-            if ip_protocol == '-1':
-                port_display = 'All Ports'
-            elif from_port == to_port:
-                port_display = str(from_port)
-            else:
-                port_display = f"{from_port}-{to_port}"
-            
-            # Get all CIDR ranges
-            cidrs = []
-            for ip_range in rule.get('IpRanges', []):
-                cidrs.append(ip_range.get('CidrIp', ''))
-            for ip_range in rule.get('Ipv6Ranges', []):
-                cidrs.append(ip_range.get('CidrIpv6', ''))
-            
-            if cidrs:
-                ingress_rules.append({
-                    'port': port_display,
-                    'protocol': ip_protocol if ip_protocol != '-1' else 'All',
-                    'source': ', '.join(cidrs)
-                })
-        
-        self.all_security_groups.append({
-            'sg_id': sg_id,
-            'sg_name': sg_name,
-            'region': region,
-            'vpc_id': vpc_id,
-            'attached_resources_count': len(attached_resources),
-            'ingress_rules': ingress_rules,
-            'is_used': len(attached_resources) > 0
-        })
 
 
-def generate_charts(analysis: Dict, output_dir: Path) -> Dict[str, str]:
-    """Generate charts for the report"""
-    charts = {}
-    findings = analysis['findings']
-    stats = analysis['stats']
-    
-    # Severity distribution pie chart
+def _analyze_region(region_data: Dict) -> Tuple[Dict, Dict, List]:
+    """Analyze one region in a worker process (top-level so it can be pickled)"""
+    analyzer = SecurityGroupAnalyzer({})
+    analyzer.analyze_region(region_data)
+    return analyzer._finding_rows, analyzer.stats, analyzer.all_security_groups
+
+
+def _render_severity_chart(by_severity: Dict[str, int], chart_path: str):
+    """Render the findings-by-severity donut chart"""
     severity_counts = {
-        'Critical': len(findings['critical']),
-        'High': len(findings['high']),
-        'Medium': len(findings['medium']),
-        'Low': len(findings['low']),
-        'Info': len(findings['info'])
+        severity.capitalize(): by_severity[severity]
+        for severity in SecurityGroupAnalyzer.SEVERITIES
     }
     
     colors = ['#dc3545', '#fd7e14', '#ffc107', '#17a2b8', '#6c757d']
     
-    fig = go.Figure(data=[go.Pie(
-        labels=list(severity_counts.keys()),
-        values=list(severity_counts.values()),
-        hole=.3,
-        marker=dict(colors=colors)
-    )])
-    fig.update_layout(
-        title="Findings by Severity",
-        showlegend=True,
-        height=300,
-        margin=dict(l=20, r=20, t=40, b=20)
-    )
-    chart_path = output_dir / 'severity_chart.png'
-    fig.write_image(str(chart_path), width=600, height=300)
-    charts['severity'] = str(chart_path)
-    
-    # Stats bar chart
-    fig = go.Figure(data=[go.Bar(
-        x=['Total Security Groups', 'Unused Groups', 'Risky Rules'],
-        y=[stats['total_sgs'], stats['unused_sgs'], stats['risky_rules']],
-        marker_color=['#007bff', '#6c757d', '#dc3545']
-    )])
-    fig.update_layout(
-        title="Security Group Statistics",
-        yaxis_title="Count",
-        showlegend=False,
-        height=300,
-        margin=dict(l=20, r=20, t=40, b=20)
+    fig = Figure(figsize=(6, 3))
+    ax = fig.subplots()
+    if any(severity_counts.values()):
+        ax.pie(
+            list(severity_counts.values()),
+            colors=colors,
+            startangle=90,
+            counterclock=False,
+            wedgeprops=dict(width=0.7)
+        )
+        ax.legend(list(severity_counts.keys()), loc='center left', bbox_to_anchor=(1, 0.5))
+    else:
+        # matplotlib refuses to draw a pie where every wedge is zero
+        ax.text(0.5, 0.5, 'No findings', ha='center', va='center')
+    ax.set_title("Findings by Severity")
+    ax.axis('equal')
+    fig.savefig(str(chart_path), dpi=100, bbox_inches='tight')
+
+
+def _render_stats_chart(stats: Dict, chart_path: str):
+    """Render the security group statistics bar chart"""
+    fig = Figure(figsize=(6, 3))
+    ax = fig.subplots()
+    ax.bar(
+        ['Total Security Groups', 'Unused Groups', 'Risky Rules'],
+        [stats['total_sgs'], stats['unused_sgs'], stats['risky_rules']],
+        color=['#007bff', '#6c757d', '#dc3545']
     )
-    chart_path = output_dir / 'stats_chart.png'
-    fig.write_image(str(chart_path), width=600, height=300)
-    charts['stats'] = str(chart_path)
+    ax.set_title("Security Group Statistics")
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+    fig.savefig(str(chart_path), dpi=100)
+
+
+def generate_charts(analysis: Dict, output_dir: Path) -> Dict[str, str]:
+    """Generate charts for the report, rendering them concurrently"""
+    charts = {
+        'severity': str(output_dir / 'severity_chart.png'),
+        'stats': str(output_dir / 'stats_chart.png')
+    }
+    
+    # The charts are independent files, so render them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_render_severity_chart, analysis['stats']['by_severity'], charts['severity']),
+            executor.submit(_render_stats_chart, analysis['stats'], charts['stats'])
+        ]
+        wait(futures)
+    
+    # Re-raise any rendering error from the worker threads
+    for future in futures:
+        future.result()
     
     return charts
 
 
+def parse_scan_timestamp(timestamp: str) -> datetime:
+    """Parse the collector's ISO 8601 UTC timestamp, e.g. 2026-01-12T14:30:22Z"""
+    # fromisoformat only accepts a trailing 'Z' from Python 3.11 onwards
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(timestamp)
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+# Directory for compiled template bytecode, reused across runs
+JINJA_CACHE_DIR = '.jinja_cache'
+
+
+@functools.lru_cache(maxsize=1)
+def get_template_env() -> Environment:
+    """Create the Jinja2 environment once, with an on-disk bytecode cache"""
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader('templates'),
+        bytecode_cache=FileSystemBytecodeCache(directory=JINJA_CACHE_DIR),
+        auto_reload=False,
+        autoescape=True
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    """Load and compile a report template once per process"""
+    return get_template_env().get_template(name)
+
+
+# Files up to this size are loaded whole; larger ones are streamed
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+# Top-level scalar fields read from the audit file header
+METADATA_KEYS = ('scan_timestamp', 'account_id', 'account_alias')
+
+
+def load_metadata(json_file: str) -> Dict[str, Any]:
+    """Read top-level scalar fields without materializing the regions"""
+    metadata = {}
+    with open(json_file, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix in METADATA_KEYS and event not in ('start_map', 'start_array'):
+                metadata[prefix] = value
+                if len(metadata) == len(METADATA_KEYS):
+                    break
+    return metadata
+
+
+def iter_regions(json_file: str) -> Iterator[Dict]:
+    """Yield region dicts one at a time from the audit file"""
+    with open(json_file, 'rb') as f:
+        yield from ijson.items(f, 'regions.item', use_float=True)
+
+
 def generate_report(json_file: str, output_dir: str = 'output'):
     """Generate comprehensive security report from JSON data"""
     
@@ -381,12 +666,16 @@ def generate_report(json_file: str, output_dir: str = 'output'):
     
     # Load data
     print(f"Loading data from: {json_file}")
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    
-    # Analyze
-    analyzer = SecurityGroupAnalyzer(data)
-    analysis = analyzer.analyze()
+    if os.path.getsize(json_file) <= STREAM_THRESHOLD_BYTES:
+        with open(json_file, 'rb') as f:
+            data = _loads(f.read())
+        analyzer = SecurityGroupAnalyzer(data)
+        analysis = analyzer.analyze()
+    else:
+        # Analyze regions as they are parsed
+        data = load_metadata(json_file)
+        analyzer = SecurityGroupAnalyzer(data)
+        analysis = analyzer.analyze_stream(iter_regions(json_file))
     
     # Setup output directory
     output_path = Path(output_dir)
@@ -399,25 +688,25 @@ def generate_report(json_file: str, output_dir: str = 'output'):
     # Prepare template data
     print("Preparing report data...")
     
+    # One timestamp for both the report header and the output file name
+    generated_at = datetime.now()
+    
     # Separate used and unused security groups for the table
     used_sgs = [sg for sg in analysis['all_security_groups'] if sg['is_used']]
     unused_sgs = [sg for sg in analysis['all_security_groups'] if not sg['is_used']]
     
     report_data = {
-        'scan_date': datetime.fromisoformat(data['scan_timestamp'].replace('Z', '+00:00')).strftime('%B %d, %Y %H:%M UTC'),
-        'generated_date': datetime.now().strftime('%B %d, %Y %H:%M'),
+        'scan_date': parse_scan_timestamp(data['scan_timestamp']).strftime('%B %d, %Y %H:%M UTC'),
+        'generated_date': generated_at.strftime('%B %d, %Y %H:%M'),
         'account_id': data['account_id'],
         'account_alias': data['account_alias'],
-        'total_regions': len(data['regions']),
+        'total_regions': analysis['stats']['total_regions'],
         'stats': analysis['stats'],
         'findings': analysis['findings'],
         'charts': charts,
         'severity_counts': {
-            'critical': len(analysis['findings']['critical']),
-            'high': len(analysis['findings']['high']),
-            'medium': len(analysis['findings']['medium']),
-            'low': len(analysis['findings']['low']),
-            'info': len(analysis['findings']['info'])
+            severity: analysis['stats']['by_severity'][severity]
+            for severity in SecurityGroupAnalyzer.SEVERITIES
         },
         'used_security_groups': used_sgs,
         'unused_security_groups': unused_sgs
@@ -425,13 +714,15 @@ def generate_report(json_file: str, output_dir: str = 'output'):
     
     # Generate HTML
     print("Generating HTML report...")
-    env = Environment(loader=FileSystemLoader('templates'))
-    template = env.get_template('report_template.html')
-    html_content = template.render(**report_data)
+    template = get_template('report_template.html')
     
-    html_file = output_path / f"security_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+    # Stream rendered chunks straight to disk rather than building the
+    # whole document in memory; buffering batches small template yields
+    html_file = output_path / f"security_report_{generated_at.strftime('%Y%m%d_%H%M%S')}.html"
+    stream = template.stream(**report_data)
+    stream.enable_buffering(size=50)
     with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        stream.dump(f)
     
     print(f"  ✓ HTML report: {html_file}")
     
@@ -440,7 +731,13 @@ def generate_report(json_file: str, output_dir: str = 'output'):
         try:
             print("Converting to PDF...")
             pdf_file = html_file.with_suffix('.pdf')
-            HTML(string=html_content, base_url=str(output_path)).write_pdf(pdf_file)
+            # Lay out the HTML streamed to disk above, so no second copy of
+            # the markup is held in RAM; images are recompressed at layout
+            document = HTML(filename=str(html_file), base_url=str(output_path)).render(
+                optimize_images=True,
+                jpeg_quality=85
+            )
+            document.write_pdf(pdf_file)
             print(f"  ✓ PDF report: {pdf_file}")
         except Exception as e:
             print(f"  ⚠ PDF generation failed: {e}")
@@ -461,8 +758,6 @@ def generate_report(json_file: str, output_dir: str = 'output'):
 
 
 if __name__ == '__main__':
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python report_generator.py <json_file>")
         print("Example: python report_generator.py sg_audit_data_20260112_143022.json")